@@ -0,0 +1,42 @@
+import time
+
+class TTLCache:
+    """Minimal in-process cache whose entries expire after a TTL.
+
+    Entries expire ttl seconds after insertion (a per-entry ttl can
+    override the default); when full, expired entries are purged and
+    then the oldest entry is evicted. Only touched from the event loop,
+    so no locking is needed.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = {}  # key -> (expires_at, value)
+
+    def get(self, key, default=None):
+        entry = self._data.get(key)
+        if entry is None:
+            return default
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._data[key]
+            return default
+        return value
+
+    def set(self, key, value, ttl: float = None):
+        if key not in self._data and len(self._data) >= self.maxsize:
+            self._evict()
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        self._data[key] = (expires_at, value)
+
+    def invalidate(self, key):
+        self._data.pop(key, None)
+
+    def _evict(self):
+        now = time.monotonic()
+        for key in [k for k, (exp, _) in self._data.items() if exp < now]:
+            del self._data[key]
+        if len(self._data) >= self.maxsize:
+            # dicts keep insertion order, so the first key is the oldest
+            del self._data[next(iter(self._data))]
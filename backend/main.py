@@ -1,32 +1,129 @@
-from fastapi import FastAPI, HTTPException, Depends, status
+from fastapi import FastAPI, HTTPException, Depends, Request, Response, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import ORJSONResponse
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from collections import defaultdict
+from contextlib import asynccontextmanager
 from datetime import timedelta
+from functools import lru_cache
 from typing import List
-import sqlite3
+import secrets
 
-from database import get_db, init_db
+import aiosqlite
+import orjson
+
+from cache import TTLCache
+from database import pool, init_db
 from auth import (
     verify_password, get_password_hash, create_access_token,
     decode_access_token, Token, User, UserCreate, ACCESS_TOKEN_EXPIRE_MINUTES
 )
 from models import Movie, MovieCreate, MovieUpdate
 
-app = FastAPI(title="Movies API")
-
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Schema setup is idempotent (IF NOT EXISTS throughout), so several
+    # workers starting at once is safe; running it here instead of at
+    # import keeps startup errors visible and out of module import.
+    init_db()
+    await pool.warmup()
+    yield
+    await pool.close()
+
+app = FastAPI(title="Movies API", default_response_class=ORJSONResponse, lifespan=lifespan)
+
+# Wildcard origins with credentials is non-conformant and makes browsers
+# re-preflight constantly; a concrete origin plus max_age lets them cache
+# the preflight for a day.
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],
+    allow_origins=["http://localhost:8501"],
     allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_methods=["GET", "POST", "PUT", "DELETE"],
+    allow_headers=["Authorization", "Content-Type"],
+    max_age=86400,
 )
+app.add_middleware(GZipMiddleware, minimum_size=512)
 
 security = HTTPBearer()
 
-init_db()
+# Hot SQL pinned as module-level constants: sqlite3 caches prepared
+# statements per connection keyed by the exact string, so reusing one
+# literal lets the pooled connections skip the parse/plan step.
+SQL_SELECT_USER = "SELECT id, username FROM users WHERE username = ?"
+SQL_USER_EXISTS = "SELECT 1 FROM users WHERE username = ?"
+SQL_SELECT_PASSWORD = "SELECT hashed_password FROM users WHERE username = ?"
+SQL_INSERT_USER = "INSERT INTO users (username, hashed_password) VALUES (?, ?)"
+SQL_SELECT_MOVIES = (
+    "SELECT id, title, director, year, genre, rating, description, user_id "
+    "FROM movies WHERE user_id = ?"
+)
+SQL_SELECT_MOVIE = (
+    "SELECT id, title, director, year, genre, rating, description, user_id "
+    "FROM movies WHERE id = ? AND user_id = ?"
+)
+SQL_INSERT_MOVIE = (
+    "INSERT INTO movies (title, director, year, genre, rating, description, user_id) "
+    "VALUES (?, ?, ?, ?, ?, ?, ?) "
+    "RETURNING id, title, director, year, genre, rating, description, user_id"
+)
+SQL_INSERT_MOVIE_BULK = (
+    "INSERT INTO movies (title, director, year, genre, rating, description, user_id) "
+    "VALUES (?, ?, ?, ?, ?, ?, ?)"
+)
+SQL_DELETE_MOVIE = "DELETE FROM movies WHERE id = ? AND user_id = ?"
+
+# The UPDATE statement only varies by which columns are set (at most 2^6
+# shapes), so memoizing per column set lets the connections' statement
+# cache reuse the prepared statement instead of re-parsing fresh SQL.
+@lru_cache(maxsize=128)
+def _update_movie_sql(columns: tuple) -> str:
+    set_clause = ", ".join(f"{col} = ?" for col in columns)
+    return (
+        f"UPDATE movies SET {set_clause} WHERE id = ? AND user_id = ? "
+        "RETURNING id, title, director, year, genre, rating, description, user_id"
+    )
 
-def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)) -> User:
+async def get_conn():
+    async with pool.borrow() as conn:
+        yield conn
+
+# The token is already the proof of identity; the DB lookup only maps
+# username -> id, so a short TTL read-through cache is safe. Per-process
+# scope is fine: each worker warms its own cache.
+_user_cache = TTLCache(maxsize=10_000, ttl=60)
+
+async def resolve_user(username: str, conn: aiosqlite.Connection) -> User:
+    user = _user_cache.get(username)
+    if user is None:
+        cursor = await conn.execute(SQL_SELECT_USER, (username,))
+        user_row = await cursor.fetchone()
+
+        if user_row is None:
+            raise HTTPException(status_code=404, detail="User not found")
+
+        user = User(id=user_row["id"], username=user_row["username"])
+        _user_cache.set(username, user)
+    return user
+
+# Streamlit refetches the movie list on every rerun, but it rarely
+# changes between fetches. Track a per-user version bumped on every
+# write; (user, version) keys both the ETag handed to clients and a
+# cache of the serialized response bytes. The random epoch keeps ETags
+# from colliding across restarts or between workers.
+_etag_epoch = secrets.token_hex(4)
+_movies_version = defaultdict(int)
+_movies_response_cache = TTLCache(maxsize=1024, ttl=300)
+
+def _movies_etag(user_id: int) -> str:
+    return f'W/"{_etag_epoch}-{user_id}-{_movies_version[user_id]}"'
+
+async def get_current_user(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    conn: aiosqlite.Connection = Depends(get_conn),
+) -> User:
     token = credentials.credentials
     token_data = decode_access_token(token)
     if token_data is None or token_data.username is None:
@@ -35,34 +132,19 @@ def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(securit
             detail="Invalid authentication credentials"
         )
 
-    conn = get_db()
-    cursor = conn.cursor()
-    cursor.execute("SELECT id, username FROM users WHERE username = ?", (token_data.username,))
-    user_row = cursor.fetchone()
-    conn.close()
-
-    if user_row is None:
-        raise HTTPException(status_code=404, detail="User not found")
-
-    return User(id=user_row["id"], username=user_row["username"])
+    return await resolve_user(token_data.username, conn)
 
 @app.post("/api/register", response_model=Token)
-def register(user: UserCreate):
-    conn = get_db()
-    cursor = conn.cursor()
-
-    cursor.execute("SELECT id FROM users WHERE username = ?", (user.username,))
-    if cursor.fetchone():
-        conn.close()
+async def register(user: UserCreate, conn: aiosqlite.Connection = Depends(get_conn)):
+    cursor = await conn.execute(SQL_USER_EXISTS, (user.username,))
+    if await cursor.fetchone():
         raise HTTPException(status_code=400, detail="Username already registered")
 
-    hashed_password = get_password_hash(user.password)
-    cursor.execute(
-        "INSERT INTO users (username, hashed_password) VALUES (?, ?)",
-        (user.username, hashed_password)
-    )
-    conn.commit()
-    conn.close()
+    # bcrypt costs ~100ms by design; run it in the threadpool so the
+    # event loop keeps serving other requests meanwhile.
+    hashed_password = await run_in_threadpool(get_password_hash, user.password)
+    await conn.execute(SQL_INSERT_USER, (user.username, hashed_password))
+    await conn.commit()
 
     access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = create_access_token(
@@ -71,14 +153,11 @@ def register(user: UserCreate):
     return {"access_token": access_token, "token_type": "bearer"}
 
 @app.post("/api/login", response_model=Token)
-def login(user: UserCreate):
-    conn = get_db()
-    cursor = conn.cursor()
-    cursor.execute("SELECT hashed_password FROM users WHERE username = ?", (user.username,))
-    user_row = cursor.fetchone()
-    conn.close()
-
-    if not user_row or not verify_password(user.password, user_row["hashed_password"]):
+async def login(user: UserCreate, conn: aiosqlite.Connection = Depends(get_conn)):
+    cursor = await conn.execute(SQL_SELECT_PASSWORD, (user.username,))
+    user_row = await cursor.fetchone()
+
+    if not user_row or not await run_in_threadpool(verify_password, user.password, user_row["hashed_password"]):
         raise HTTPException(status_code=401, detail="Incorrect username or password")
 
     access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
@@ -87,53 +166,86 @@ def login(user: UserCreate):
     )
     return {"access_token": access_token, "token_type": "bearer"}
 
-@app.get("/api/movies", response_model=List[Movie])
-def get_movies(current_user: User = Depends(get_current_user)):
-    conn = get_db()
-    cursor = conn.cursor()
-    cursor.execute(
-        "SELECT id, title, director, year, genre, rating, description, user_id FROM movies WHERE user_id = ?",
-        (current_user.id,)
-    )
-    movies = cursor.fetchall()
-    conn.close()
-
-    return [dict(movie) for movie in movies]
+@app.get("/api/movies", response_model=None)
+async def get_movies(
+    request: Request,
+    current_user: User = Depends(get_current_user),
+    conn: aiosqlite.Connection = Depends(get_conn),
+):
+    etag = _movies_etag(current_user.id)
+
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+
+    body = _movies_response_cache.get(etag)
+    if body is None:
+        cursor = await conn.execute(SQL_SELECT_MOVIES, (current_user.id,))
+        movies = await cursor.fetchall()
+
+        # Build the response positionally and serialize with orjson directly:
+        # dict(Row) does a Python-level lookup per key, and response_model
+        # would re-validate every row through Pydantic just to dump it again.
+        body = orjson.dumps([
+            {"id": r[0], "title": r[1], "director": r[2], "year": r[3],
+             "genre": r[4], "rating": r[5], "description": r[6], "user_id": r[7]}
+            for r in movies
+        ])
+        _movies_response_cache.set(etag, body)
+
+    return Response(content=body, media_type="application/json", headers={"ETag": etag})
 
 @app.post("/api/movies", response_model=Movie, status_code=status.HTTP_201_CREATED)
-def create_movie(movie: MovieCreate, current_user: User = Depends(get_current_user)):
-    conn = get_db()
-    cursor = conn.cursor()
-    cursor.execute(
-        """INSERT INTO movies (title, director, year, genre, rating, description, user_id)
-           VALUES (?, ?, ?, ?, ?, ?, ?)""",
+async def create_movie(
+    movie: MovieCreate,
+    current_user: User = Depends(get_current_user),
+    conn: aiosqlite.Connection = Depends(get_conn),
+):
+    cursor = await conn.execute(
+        SQL_INSERT_MOVIE,
         (movie.title, movie.director, movie.year, movie.genre, movie.rating, movie.description, current_user.id)
     )
-    conn.commit()
-    movie_id = cursor.lastrowid
-    conn.close()
-
-    return {
-        "id": movie_id,
-        "title": movie.title,
-        "director": movie.director,
-        "year": movie.year,
-        "genre": movie.genre,
-        "rating": movie.rating,
-        "description": movie.description,
-        "user_id": current_user.id
-    }
+    created_movie = await cursor.fetchone()
+    await conn.commit()
+    _movies_version[current_user.id] += 1
+
+    return dict(created_movie)
+
+@app.post("/api/movies/bulk", response_model=None, status_code=status.HTTP_201_CREATED)
+async def create_movies_bulk(
+    movies: List[MovieCreate],
+    current_user: User = Depends(get_current_user),
+    conn: aiosqlite.Connection = Depends(get_conn),
+):
+    if not movies:
+        return ORJSONResponse({"ids": []}, status_code=status.HTTP_201_CREATED)
+
+    rows = [
+        (m.title, m.director, m.year, m.genre, m.rating, m.description, current_user.id)
+        for m in movies
+    ]
+    # executemany runs inside one implicit transaction, so N inserts cost
+    # a single commit/fsync instead of one each.
+    await conn.executemany(SQL_INSERT_MOVIE_BULK, rows)
+    await conn.commit()
+    _movies_version[current_user.id] += 1
+
+    cursor = await conn.execute(
+        "SELECT id FROM movies WHERE user_id = ? ORDER BY id DESC LIMIT ?",
+        (current_user.id, len(rows))
+    )
+    ids = [r[0] for r in await cursor.fetchall()]
+    ids.reverse()
+
+    return ORJSONResponse({"ids": ids}, status_code=status.HTTP_201_CREATED)
 
 @app.get("/api/movies/{movie_id}", response_model=Movie)
-def get_movie(movie_id: int, current_user: User = Depends(get_current_user)):
-    conn = get_db()
-    cursor = conn.cursor()
-    cursor.execute(
-        "SELECT id, title, director, year, genre, rating, description, user_id FROM movies WHERE id = ? AND user_id = ?",
-        (movie_id, current_user.id)
-    )
-    movie = cursor.fetchone()
-    conn.close()
+async def get_movie(
+    movie_id: int,
+    current_user: User = Depends(get_current_user),
+    conn: aiosqlite.Connection = Depends(get_conn),
+):
+    cursor = await conn.execute(SQL_SELECT_MOVIE, (movie_id, current_user.id))
+    movie = await cursor.fetchone()
 
     if not movie:
         raise HTTPException(status_code=404, detail="Movie not found")
@@ -141,52 +253,54 @@ def get_movie(movie_id: int, current_user: User = Depends(get_current_user)):
     return dict(movie)
 
 @app.put("/api/movies/{movie_id}", response_model=Movie)
-def update_movie(movie_id: int, movie_update: MovieUpdate, current_user: User = Depends(get_current_user)):
-    conn = get_db()
-    cursor = conn.cursor()
+async def update_movie(
+    movie_id: int,
+    movie_update: MovieUpdate,
+    current_user: User = Depends(get_current_user),
+    conn: aiosqlite.Connection = Depends(get_conn),
+):
+    update_data = movie_update.model_dump(exclude_unset=True)
 
-    cursor.execute("SELECT * FROM movies WHERE id = ? AND user_id = ?", (movie_id, current_user.id))
-    existing_movie = cursor.fetchone()
+    if not update_data:
+        cursor = await conn.execute(SQL_SELECT_MOVIE, (movie_id, current_user.id))
+        movie = await cursor.fetchone()
 
-    if not existing_movie:
-        conn.close()
-        raise HTTPException(status_code=404, detail="Movie not found")
+        if not movie:
+            raise HTTPException(status_code=404, detail="Movie not found")
 
-    update_data = movie_update.model_dump(exclude_unset=True)
+        return dict(movie)
 
-    if update_data:
-        set_clause = ", ".join([f"{key} = ?" for key in update_data.keys()])
-        values = list(update_data.values()) + [movie_id, current_user.id]
-        cursor.execute(
-            f"UPDATE movies SET {set_clause} WHERE id = ? AND user_id = ?",
-            values
-        )
-        conn.commit()
+    # RETURNING folds the existence check, the update and the re-read
+    # into a single statement; no matching row doubles as the 404 check.
+    columns = tuple(sorted(update_data))
+    values = [update_data[col] for col in columns] + [movie_id, current_user.id]
+    cursor = await conn.execute(_update_movie_sql(columns), values)
+    updated_movie = await cursor.fetchone()
 
-    cursor.execute(
-        "SELECT id, title, director, year, genre, rating, description, user_id FROM movies WHERE id = ?",
-        (movie_id,)
-    )
-    updated_movie = cursor.fetchone()
-    conn.close()
+    if updated_movie is None:
+        raise HTTPException(status_code=404, detail="Movie not found")
+
+    await conn.commit()
+    _movies_version[current_user.id] += 1
 
     return dict(updated_movie)
 
 @app.delete("/api/movies/{movie_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_movie(movie_id: int, current_user: User = Depends(get_current_user)):
-    conn = get_db()
-    cursor = conn.cursor()
-    cursor.execute("DELETE FROM movies WHERE id = ? AND user_id = ?", (movie_id, current_user.id))
+async def delete_movie(
+    movie_id: int,
+    current_user: User = Depends(get_current_user),
+    conn: aiosqlite.Connection = Depends(get_conn),
+):
+    cursor = await conn.execute(SQL_DELETE_MOVIE, (movie_id, current_user.id))
 
     if cursor.rowcount == 0:
-        conn.close()
         raise HTTPException(status_code=404, detail="Movie not found")
 
-    conn.commit()
-    conn.close()
+    await conn.commit()
+    _movies_version[current_user.id] += 1
 
     return None
 
 @app.get("/")
-def root():
+async def root():
     return {"message": "Movies API is running"}
@@ -1,12 +1,26 @@
 import streamlit as st
+import orjson
 import requests
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
 from typing import Optional
 
 API_URL = "http://localhost:8000/api"
 
+GENRES = ("Action", "Comedy", "Drama", "Horror", "Sci-Fi", "Thriller", "Romance", "Documentary", "Other")
+GENRE_INDEX = {genre: idx for idx, genre in enumerate(GENRES)}
+
 st.set_page_config(page_title="Movie Manager", layout="wide")
 
 def init_session_state():
+    if "http" not in st.session_state:
+        # A persistent Session reuses keep-alive connections across
+        # Streamlit reruns instead of paying a TCP handshake per call.
+        session = requests.Session()
+        session.mount("http://", HTTPAdapter(pool_connections=4, pool_maxsize=16))
+        st.session_state.http = session
+    if "executor" not in st.session_state:
+        st.session_state.executor = ThreadPoolExecutor(max_workers=8)
     if "token" not in st.session_state:
         st.session_state.token = None
     if "username" not in st.session_state:
@@ -16,12 +30,12 @@ def init_session_state():
 
 def login(username: str, password: str) -> Optional[str]:
     try:
-        response = requests.post(
+        response = st.session_state.http.post(
             f"{API_URL}/login",
             json={"username": username, "password": password}
         )
         if response.status_code == 200:
-            return response.json()["access_token"]
+            return orjson.loads(response.content)["access_token"]
         return None
     except Exception as e:
         st.error(f"Login error: {str(e)}")
@@ -29,7 +43,7 @@ def login(username: str, password: str) -> Optional[str]:
 
 def register(username: str, password: str) -> bool:
     try:
-        response = requests.post(
+        response = st.session_state.http.post(
             f"{API_URL}/register",
             json={"username": username, "password": password},
             timeout=5
@@ -53,12 +67,12 @@ def register(username: str, password: str) -> bool:
 
 def get_movies(token: str):
     try:
-        response = requests.get(
+        response = st.session_state.http.get(
             f"{API_URL}/movies",
             headers={"Authorization": f"Bearer {token}"}
         )
         if response.status_code == 200:
-            return response.json()
+            return orjson.loads(response.content)
         return []
     except Exception as e:
         st.error(f"Error fetching movies: {str(e)}")
@@ -66,7 +80,7 @@ def get_movies(token: str):
 
 def create_movie(token: str, movie_data: dict):
     try:
-        response = requests.post(
+        response = st.session_state.http.post(
             f"{API_URL}/movies",
             json=movie_data,
             headers={"Authorization": f"Bearer {token}"}
@@ -76,29 +90,62 @@ def create_movie(token: str, movie_data: dict):
         st.error(f"Error creating movie: {str(e)}")
         return False
 
+# The raw requests take the Session explicitly so they can run on
+# executor threads, which have no Streamlit script context and therefore
+# no st.session_state (and where st.error is a no-op anyway).
+def _update_request(http: requests.Session, token: str, movie_id: int, movie_data: dict) -> bool:
+    response = http.put(
+        f"{API_URL}/movies/{movie_id}",
+        json=movie_data,
+        headers={"Authorization": f"Bearer {token}"}
+    )
+    return response.status_code == 200
+
+def _delete_request(http: requests.Session, token: str, movie_id: int) -> bool:
+    response = http.delete(
+        f"{API_URL}/movies/{movie_id}",
+        headers={"Authorization": f"Bearer {token}"}
+    )
+    return response.status_code == 204
+
 def update_movie(token: str, movie_id: int, movie_data: dict):
     try:
-        response = requests.put(
-            f"{API_URL}/movies/{movie_id}",
-            json=movie_data,
-            headers={"Authorization": f"Bearer {token}"}
-        )
-        return response.status_code == 200
+        return _update_request(st.session_state.http, token, movie_id, movie_data)
     except Exception as e:
         st.error(f"Error updating movie: {str(e)}")
         return False
 
 def delete_movie(token: str, movie_id: int):
     try:
-        response = requests.delete(
-            f"{API_URL}/movies/{movie_id}",
-            headers={"Authorization": f"Bearer {token}"}
-        )
-        return response.status_code == 204
+        return _delete_request(st.session_state.http, token, movie_id)
     except Exception as e:
         st.error(f"Error deleting movie: {str(e)}")
         return False
 
+def bulk_delete(token: str, movie_ids: list) -> bool:
+    """Delete several movies concurrently; True only if all succeeded."""
+    http = st.session_state.http
+
+    def worker(movie_id):
+        try:
+            return _delete_request(http, token, movie_id)
+        except Exception:
+            return False
+
+    return all(st.session_state.executor.map(worker, movie_ids))
+
+def bulk_update(token: str, items: list) -> bool:
+    """Apply several (movie_id, movie_data) updates concurrently."""
+    http = st.session_state.http
+
+    def worker(item):
+        try:
+            return _update_request(http, token, item[0], item[1])
+        except Exception:
+            return False
+
+    return all(st.session_state.executor.map(worker, items))
+
 def show_login_page():
     st.title("Movie Manager")
 
@@ -144,6 +191,50 @@ def show_login_page():
             else:
                 st.warning("Please fill in all fields")
 
+@st.fragment
+def render_movie_grid(movies):
+    st.subheader(f"Your Movies ({len(movies)})")
+
+    cols = st.columns(3)
+
+    for idx, movie in enumerate(movies):
+        with cols[idx % 3]:
+            with st.container(border=True):
+                # One markdown blob per card means one widget delta over
+                # the websocket instead of one per field.
+                parts = [f"### {movie['title']}"]
+
+                if movie.get('director'):
+                    parts.append(f"**Director:** {movie['director']}")
+
+                if movie.get('year'):
+                    parts.append(f"**Year:** {movie['year']}")
+
+                if movie.get('genre'):
+                    parts.append(f"**Genre:** {movie['genre']}")
+
+                if movie.get('rating'):
+                    parts.append(f"**Rating:** {movie['rating']}/10")
+
+                st.markdown("\n\n".join(parts))
+
+                if movie.get('description'):
+                    with st.expander("Description"):
+                        st.write(movie['description'])
+
+                col1, col2 = st.columns(2)
+
+                with col1:
+                    if st.button("Edit", key=f"edit_{movie['id']}", use_container_width=True):
+                        st.session_state.editing_movie = movie
+                        st.rerun()
+
+                with col2:
+                    if st.button("Delete", key=f"delete_{movie['id']}", type="secondary", use_container_width=True):
+                        if delete_movie(st.session_state.token, movie['id']):
+                            st.success("Movie deleted!")
+                            st.rerun()
+
 def show_movie_manager():
     st.title("Movie Manager")
 
@@ -164,7 +255,7 @@ def show_movie_manager():
             title = st.text_input("Title*")
             director = st.text_input("Director")
             year = st.number_input("Year", min_value=1800, max_value=2100, value=2024, step=1)
-            genre = st.selectbox("Genre", ["Action", "Comedy", "Drama", "Horror", "Sci-Fi", "Thriller", "Romance", "Documentary", "Other"])
+            genre = st.selectbox("Genre", GENRES)
             rating = st.slider("Rating", 0.0, 10.0, 5.0, 0.1)
             description = st.text_area("Description")
 
@@ -192,43 +283,7 @@ def show_movie_manager():
     if not movies:
         st.info("No movies found. Add your first movie using the sidebar!")
     else:
-        st.subheader(f"Your Movies ({len(movies)})")
-
-        cols = st.columns(3)
-
-        for idx, movie in enumerate(movies):
-            with cols[idx % 3]:
-                with st.container(border=True):
-                    st.markdown(f"### {movie['title']}")
-
-                    if movie.get('director'):
-                        st.write(f"**Director:** {movie['director']}")
-
-                    if movie.get('year'):
-                        st.write(f"**Year:** {movie['year']}")
-
-                    if movie.get('genre'):
-                        st.write(f"**Genre:** {movie['genre']}")
-
-                    if movie.get('rating'):
-                        st.write(f"**Rating:** {movie['rating']}/10")
-
-                    if movie.get('description'):
-                        with st.expander("Description"):
-                            st.write(movie['description'])
-
-                    col1, col2 = st.columns(2)
-
-                    with col1:
-                        if st.button("Edit", key=f"edit_{movie['id']}", use_container_width=True):
-                            st.session_state.editing_movie = movie
-                            st.rerun()
-
-                    with col2:
-                        if st.button("Delete", key=f"delete_{movie['id']}", type="secondary", use_container_width=True):
-                            if delete_movie(st.session_state.token, movie['id']):
-                                st.success("Movie deleted!")
-                                st.rerun()
+        render_movie_grid(movies)
 
     if "editing_movie" in st.session_state:
         movie = st.session_state.editing_movie
@@ -239,8 +294,8 @@ def show_movie_manager():
                 year = st.number_input("Year", min_value=1800, max_value=2100, value=movie.get('year', 2024), step=1)
                 genre = st.selectbox(
                     "Genre",
-                    ["Action", "Comedy", "Drama", "Horror", "Sci-Fi", "Thriller", "Romance", "Documentary", "Other"],
-                    index=["Action", "Comedy", "Drama", "Horror", "Sci-Fi", "Thriller", "Romance", "Documentary", "Other"].index(movie.get('genre', 'Other'))
+                    GENRES,
+                    index=GENRE_INDEX.get(movie.get('genre'), GENRE_INDEX['Other'])
                 )
                 rating = st.slider("Rating", 0.0, 10.0, float(movie.get('rating', 5.0)), 0.1)
                 description = st.text_area("Description", value=movie.get('description', ''))